@@ -4,19 +4,57 @@ Streamlit Application - Main Interface
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import ee
 import geemap.foliumap as geemap
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from datetime import datetime
-import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import threading
+from joblib import Memory
 
 from gee_analysis import KerichoForestAnalysis
 
 
+# ═══════════════════════════════════════════════════════════════════
+# DISPLAY CONSTANTS
+# ═══════════════════════════════════════════════════════════════════
+
+# Static images are served from the repo instead of an external placeholder service
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+CLASS_NAMES = ('Forest', 'Tea Plantations', 'Other Vegetation', 'Bare Soil/Land', 'Built-up')
+CLASS_COLORS_HEX = ('#006400', '#90EE90', '#ADFF2F', '#D2B48C', '#FF0000')
+
+# Change bars are colored by the class the area transitioned from
+SOURCE_COLOR_MAP = dict(enumerate(CLASS_COLORS_HEX))
+
+# Per-series point budget for trend charts; longer series are downsampled before plotting
+MAX_CHART_POINTS = 500
+
+# Shared Plotly layout pieces
+H_LEGEND = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+PIE_MARKER = dict(colors=list(CLASS_COLORS_HEX))
+
+VEG_INDICES = ('NDVI', 'EVI', 'NDWI', 'SAVI', 'NBR', 'BSI', 'NDBI', 'MNDWI')
+
+# Map visualization parameters for each vegetation index (keys match VEG_INDICES)
+VEG_VIS_PARAMS = {
+    'NDVI': {'min': -0.2, 'max': 0.8, 'palette': ['ff0000', 'ffff00', '00ff00']},
+    'EVI': {'min': -0.2, 'max': 0.8, 'palette': ['8B4513', 'ffff00', '00ff00']},
+    'NDWI': {'min': -0.5, 'max': 0.5, 'palette': ['8B4513', 'ffffff', '0000ff']},
+    'SAVI': {'min': -0.2, 'max': 0.8, 'palette': ['ff0000', 'ffff00', '00ff00']},
+    'NBR': {'min': -0.5, 'max': 0.5, 'palette': ['ff0000', 'ffff00', '00ff00']},
+    'BSI': {'min': -1, 'max': 1, 'palette': ['00ff00', 'ffffff', '8B4513']},
+    'NDBI': {'min': -1, 'max': 1, 'palette': ['00ff00', 'ffffff', '808080']},
+    'MNDWI': {'min': -0.5, 'max': 0.5, 'palette': ['8B4513', 'ffffff', '0000ff']}
+}
+
+
 # ═══════════════════════════════════════════════════════════════════
 # PAGE CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════
@@ -86,10 +124,505 @@ def initialize_gee():
         st.error(f"⚠️ GEE Initialization failed: {e}")
         st.info("Check service account credentials in Streamlit Cloud secrets")
         return False
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_analyzer():
+    """
+    Process-wide analysis object, not yet initialized.
+    
+    Only construction happens here: Streamlit replays element calls made
+    inside cached functions, so the progress UI must stay outside.
+    """
+    return {
+        'analyzer': KerichoForestAnalysis(),
+        'lock': threading.Lock(),
+        'ready': False,
+    }
+
+
+def get_analyzer(progress_callback=None):
+    """
+    Get the shared, fully initialized analysis object.
+    
+    The first caller runs initialization under the lock and gets
+    `progress_callback` updates; every later session, including a page
+    refresh, gets the ready analyzer straight away. The returned analyzer
+    must not be mutated by widget handlers.
+    """
+    shared = _shared_analyzer()
+    with shared['lock']:
+        if not shared['ready']:
+            shared['analyzer'].initialize_analysis(progress_callback)
+            shared['ready'] = True
+    return shared['analyzer']
+
+
+# ═══════════════════════════════════════════════════════════════════
+# CACHED ANALYSIS RESULTS
+# ═══════════════════════════════════════════════════════════════════
+# The leading underscore on `_analyzer` tells Streamlit not to hash it;
+# the analyzer is a single cached resource, so the remaining args are
+# enough to key each result. In-memory entries are dropped after an hour
+# and capped in number to bound server memory.
+#
+# Underneath, every GEE query is also persisted to disk so a server restart
+# does not re-run them from cold. So an in-memory miss, including after the
+# hour is up, is answered from disk when possible. Disk entries are keyed on
+# the analyzer's cache_key() rather than the analyzer object. That key
+# changes with the inputs, with the boundary and training assets'
+# updateTime (re-read hourly), and with the results schema version. Those
+# changes are what invalidate a disk entry. Entries left unused for
+# GEE_DISK_CACHE_AGE are pruned once per server process.
+#
+# The store lives in a per-user directory rather than shared /tmp, since
+# joblib unpickles whatever it finds there.
+
+GEE_DISK_CACHE = Memory(Path.home() / ".cache" / "kericho_forest_tool" / "gee_cache", verbose=0)
+GEE_DISK_CACHE_AGE = timedelta(days=30)
+
+
+@st.cache_resource(show_spinner=False)
+def _prune_disk_cache():
+    """Drop disk-cached results not used within GEE_DISK_CACHE_AGE."""
+    GEE_DISK_CACHE.reduce_size(age_limit=GEE_DISK_CACHE_AGE)
+
+
+_prune_disk_cache()
+
+
+@GEE_DISK_CACHE.cache(ignore=['analyzer'])
+def _disk_query(analyzer, cache_key, method, *args):
+    """Run an analyzer query method, persisting its result under `cache_key`."""
+    return getattr(analyzer, method)(*args)
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _lc_areas(_analyzer):
+    """Cached land cover areas for all years."""
+    return _disk_query(_analyzer, _analyzer.cache_key(), 'calculate_land_cover_areas')
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _veg_trends(_analyzer):
+    """Cached mean vegetation indices for all years."""
+    return _disk_query(_analyzer, _analyzer.cache_key(), 'get_vegetation_indices_trends')
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _climate(_analyzer):
+    """Cached climate trends for all years."""
+    return _disk_query(_analyzer, _analyzer.cache_key(), 'get_climate_trends')
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _change(_analyzer, year_from, year_to):
+    """Cached change matrix between two years, with bar colors attached."""
+    df = _disk_query(_analyzer, _analyzer.cache_key(), 'calculate_change_matrix',
+                     year_from, year_to)
+    if len(df) > 0:
+        # Color by source class
+        df['Color'] = df['From_Class_ID'].map(SOURCE_COLOR_MAP)
+    return df
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _multi_period_changes(_analyzer):
+    """Cached change matrices for the standard comparison periods."""
+    periods = [
+        (1995, 2005, "1995-2005"),
+        (2005, 2015, "2005-2015"),
+        (2015, 2024, "2015-2024"),
+        (1995, 2024, "1995-2024 (Overall)")
+    ]
+    
+    all_changes = {}
+    for from_yr, to_yr, label in periods:
+        change_matrix = _change(_analyzer, from_yr, to_yr)
+        if len(change_matrix) > 0:
+            all_changes[label] = change_matrix
+    
+    return all_changes
+
+
+@st.cache_data(show_spinner=False)
+def _downsample_by_year(df, max_points=MAX_CHART_POINTS):
+    """
+    Cached min/max downsampling of a per-year table to the chart point budget.
+    
+    Interior rows are split into buckets and every value column keeps the
+    rows holding its bucket minimum and maximum, plus the first and last
+    year, so peaks and troughs survive. Tables within budget pass through.
+    """
+    if len(df) <= max_points:
+        return df
+    
+    values = df.drop(columns='Year').to_numpy(dtype=float)
+    n_buckets = max(1, (max_points - 2) // (2 * values.shape[1]))
+    keep = [0, len(df) - 1]
+    for bucket in np.array_split(np.arange(1, len(df) - 1), n_buckets):
+        block = values[bucket]
+        # Missing values never win a bucket
+        keep.extend(bucket[np.argmin(np.where(np.isnan(block), np.inf, block), axis=0)])
+        keep.extend(bucket[np.argmax(np.where(np.isnan(block), -np.inf, block), axis=0)])
+    return df.iloc[np.unique(keep)]
+
+
+@st.cache_data(show_spinner=False)
+def _melt_by_year(df, var_name, value_name):
+    """Cached long-format version of a per-year table for Plotly Express."""
+    return df.melt(id_vars='Year', var_name=var_name, value_name=value_name)
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df):
+    """Cached UTF-8 CSV payload for a download button."""
+    return df.to_csv(index=False).encode('utf-8')
+
+
+# ═══════════════════════════════════════════════════════════════════
+# CACHED FIGURES
+# ═══════════════════════════════════════════════════════════════════
+# Figures are fully determined by their input tables, so reruns that
+# don't change the data reuse the pickled figure instead of rebuilding it.
+
+@st.cache_data(show_spinner=False)
+def _fig_lc_trend(lc_melt, title=None):
+    """Land cover area trend lines for the Home dashboard and the report."""
+    import plotly.express as px
+    
+    fig = px.line(lc_melt, x='Year', y='Area', color='Class', markers=True)
+    fig.update_traces(line=dict(width=3), marker=dict(size=8))
+    
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Area (km²)",
+        hovermode='x unified',
+        height=400
+    )
+    if title:
+        # Titled (report) version keeps the default legend clear of the title
+        fig.update_layout(title=title)
+    else:
+        fig.update_layout(legend=H_LEGEND)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _fig_veg_trend(veg_melt, indices, title=None, height=500, marker_size=10):
+    """Trend lines for the selected vegetation indices."""
+    import plotly.express as px
+    
+    fig = px.line(
+        veg_melt[veg_melt['Index'].isin(indices)],
+        x='Year', y='Value', color='Index', markers=True
+    )
+    fig.update_traces(line=dict(width=3), marker=dict(size=marker_size))
+    
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Index Value",
+        height=height,
+        hovermode='x unified'
+    )
+    if title:
+        fig.update_layout(title=title)
+    else:
+        fig.update_layout(legend=H_LEGEND)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _fig_report_changes(change_df):
+    """Horizontal bar chart of significant transitions for the report."""
+    fig = go.Figure(go.Bar(
+        x=change_df['Area (km²)'],
+        y=change_df['Transition'],
+        orientation='h',
+        marker=dict(color='#2d5016')
+    ))
+    
+    fig.update_layout(
+        title="Significant Transitions",
+        xaxis_title="Area (km²)",
+        height=max(300, len(change_df) * 40)
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _fig_lc_pie(row):
+    """Donut chart of the land cover distribution for one year."""
+    fig = go.Figure(data=[go.Pie(
+        labels=row.index.tolist(),
+        values=row.values.tolist(),
+        hole=0.4,
+        marker=PIE_MARKER
+    )])
+    
+    fig.update_layout(height=400)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _fig_lc_stacked(lc_melt):
+    """Stacked bar chart of land cover areas by year."""
+    import plotly.express as px
+    
+    fig = px.bar(lc_melt, x='Year', y='Area', color='Class')
+    
+    fig.update_layout(
+        barmode='stack',
+        xaxis_title="Year",
+        yaxis_title="Area (km²)",
+        height=450,
+        legend=H_LEGEND
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _fig_year_pies(lc_indexed):
+    """One row of land cover pie charts, one per year, in a single figure."""
+    from plotly.subplots import make_subplots
+    
+    years = lc_indexed.index.tolist()
+    fig = make_subplots(
+        rows=1,
+        cols=len(years),
+        specs=[[{'type': 'domain'}] * len(years)],
+        subplot_titles=[str(y) for y in years]
+    )
+    
+    for idx, year in enumerate(years):
+        row = lc_indexed.loc[year]
+        fig.add_trace(go.Pie(
+            labels=row.index.tolist(),
+            values=row.values.tolist(),
+            name=str(year),
+            hole=0.3,
+            marker=PIE_MARKER
+        ), row=1, col=idx + 1)
+    
+    fig.update_layout(
+        height=300,
+        showlegend=False
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _climate_dual_fig(climate_data, title=None, height=500, marker_size=10):
+    """Temperature and precipitation on a shared year axis."""
+    from plotly.subplots import make_subplots
+    
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    # Temperature
+    fig.add_trace(
+        go.Scatter(
+            x=climate_data['Year'],
+            y=climate_data['Temperature (°C)'],
+            name="Temperature",
+            line=dict(color='red', width=3),
+            marker=dict(size=marker_size)
+        ),
+        secondary_y=False
+    )
+    
+    # Precipitation
+    fig.add_trace(
+        go.Scatter(
+            x=climate_data['Year'],
+            y=climate_data['Precipitation (mm)'],
+            name="Precipitation",
+            line=dict(color='blue', width=3),
+            marker=dict(size=marker_size)
+        ),
+        secondary_y=True
+    )
+    
+    fig.update_xaxes(title_text="Year")
+    fig.update_yaxes(title_text="Temperature (°C)", secondary_y=False)
+    fig.update_yaxes(title_text="Precipitation (mm)", secondary_y=True)
+    
+    if title:
+        # Titled (report) version keeps the default legend clear of the title
+        fig.update_layout(
+            title=title,
+            height=height,
+            hovermode='x unified'
+        )
+    else:
+        fig.update_layout(
+            height=height,
+            hovermode='x unified',
+            legend=H_LEGEND
+        )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _temp_area_fig(climate_data):
+    """Filled temperature trend chart."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=climate_data['Year'],
+        y=climate_data['Temperature (°C)'],
+        mode='lines+markers',
+        fill='tozeroy',
+        line=dict(color='red', width=3),
+        marker=dict(size=10)
+    ))
+    
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Temperature (°C)",
+        height=350
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _precip_area_fig(climate_data):
+    """Filled precipitation trend chart."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=climate_data['Year'],
+        y=climate_data['Precipitation (mm)'],
+        mode='lines+markers',
+        fill='tozeroy',
+        line=dict(color='blue', width=3),
+        marker=dict(size=10)
+    ))
+    
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Precipitation (mm)",
+        height=350
+    )
+    return fig
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MAP FRAGMENTS
+# ═══════════════════════════════════════════════════════════════════
+# Each map and its selectors rerun as a fragment, so changing the map
+# year or layer doesn't rerun the tables and charts above it.
+
+@st.cache_resource
+def _base_map(_analyzer):
+    """Base map with the study area boundary, built once per analyzer."""
+    Map = geemap.Map(center=[-0.37, 35.28], zoom=10)
+    Map.addLayer(_analyzer.kericho, {}, 'Study Area', opacity=0.5)
+    return Map
+
+
+def _new_map(analyzer):
+    """Fresh copy of the base map to add this rerun's dynamic layer to."""
+    # Copy so dynamic layers don't accumulate on the cached base map
+    return copy.deepcopy(_base_map(analyzer))
+
+
 @st.cache_resource
-def get_analysis_object():
-    """Get cached analysis object."""
-    return KerichoForestAnalysis()
+def _index_layers(_analyzer):
+    """Single-band index images clipped for display, keyed by (year, index)."""
+    return {
+        (year, index): _analyzer.indices[year].select(index).clip(_analyzer.kericho_geom)
+        for year in _analyzer.years
+        for index in VEG_INDICES
+    }
+
+
+@st.fragment
+def _render_landcover_map(analyzer):
+    """Year selector and classified land cover map."""
+    map_year = st.selectbox("Select year to display:", analyzer.years, index=3)
+    
+    Map = _new_map(analyzer)
+    
+    # Add classified layer
+    vis_params = {
+        'min': 0,
+        'max': 4,
+        'palette': analyzer.class_colors
+    }
+    Map.addLayer(
+        analyzer.classified[map_year].clip(analyzer.kericho_geom),
+        vis_params,
+        f'{map_year} Land Cover'
+    )
+    
+    Map.to_streamlit(height=600)
+
+
+@st.fragment
+def _render_index_map(analyzer):
+    """Index/year selectors and vegetation index map."""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        selected_index = st.selectbox(
+            "Select index:",
+            VEG_INDICES
+        )
+    
+    with col2:
+        selected_year = st.selectbox(
+            "Select year:",
+            analyzer.years,
+            index=3
+        )
+    
+    Map = _new_map(analyzer)
+    
+    # Add index layer
+    Map.addLayer(
+        _index_layers(analyzer)[(selected_year, selected_index)],
+        VEG_VIS_PARAMS[selected_index],
+        f'{selected_year} - {selected_index}'
+    )
+    
+    Map.to_streamlit(height=600)
+
+
+@st.fragment
+def _render_climate_map(analyzer):
+    """Variable/year selectors and climate map."""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        climate_var = st.selectbox(
+            "Select variable:",
+            ['Temperature', 'Precipitation']
+        )
+    
+    with col2:
+        climate_year = st.selectbox(
+            "Select year:",
+            analyzer.years,
+            index=3,
+            key='climate_year'
+        )
+    
+    Map = _new_map(analyzer)
+    
+    # Visualization parameters
+    if climate_var == 'Temperature':
+        vis_params = {'min': 15, 'max': 35, 'palette': ['0000ff', 'ffffff', 'ff0000']}
+        band_name = 'temperature'
+    else:
+        vis_params = {'min': 800, 'max': 2000, 'palette': ['ffffff', '0000ff', '00008b']}
+        band_name = 'precipitation'
+    
+    # Add climate layer
+    Map.addLayer(
+        analyzer.climate[climate_year].select(band_name).clip(analyzer.kericho_geom),
+        vis_params,
+        f'{climate_year} - {climate_var}'
+    )
+    
+    Map.to_streamlit(height=600)
 
 
 # Initialize
@@ -125,8 +658,7 @@ st.markdown("""
 # ═══════════════════════════════════════════════════════════════════
 
 with st.sidebar:
-    st.image("https://via.placeholder.com/300x100/2d5016/ffffff?text=Kericho+County", 
-             use_container_width=True)
+    st.image(str(ASSETS_DIR / "kericho_sidebar.png"), use_container_width=True)
     
     st.markdown("### 📊 Analysis Control Panel")
     
@@ -137,34 +669,17 @@ with st.sidebar:
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                def progress_callback(message):
+                def progress_callback(pct, message):
+                    progress_bar.progress(pct)
                     status_text.text(message)
-                    time.sleep(0.5)
-                
-                analyzer = get_analysis_object()
-                
-                # Progress simulation (GEE operations happen server-side)
-                progress_bar.progress(20)
-                status_text.text("Loading satellite imagery...")
-                time.sleep(1)
                 
-                progress_bar.progress(50)
-                status_text.text("Calculating vegetation indices...")
-                time.sleep(1)
+                # Progress is reported by each GEE stage as it finishes.
+                # Stored straight into session state so the sidebar doesn't
+                # bind a module-level `analyzer` ahead of the main area's.
+                st.session_state.analyzer = get_analyzer(progress_callback)
                 
-                progress_bar.progress(80)
-                status_text.text("Running classifications...")
-                time.sleep(1)
-                
-                # Actually run the initialization
-                analyzer.initialize_analysis(progress_callback)
-                
-                progress_bar.progress(100)
-                status_text.text("✅ Analysis ready!")
-                
-                st.session_state.analyzer = analyzer
                 st.session_state.analysis_ready = True
-                time.sleep(1)
+                progress_bar.empty()
                 st.rerun()
     else:
         st.success("✅ Analysis Initialized")
@@ -189,11 +704,11 @@ with st.sidebar:
         
         # Legend
         st.markdown("### 🎨 Land Cover Legend")
-        class_colors_hex = ['#006400', '#90EE90', '#ADFF2F', '#D2B48C', '#FF0000']
-        class_names = ['Forest', 'Tea Plantations', 'Other Vegetation', 'Bare Soil/Land', 'Built-up']
-        
-        for color, name in zip(class_colors_hex, class_names):
-            st.markdown(f'<span style="color:{color}">⬛</span> {name}', unsafe_allow_html=True)
+        legend_html = "<br>".join(
+            f'<span style="color:{color}">⬛</span> {name}'
+            for color, name in zip(CLASS_COLORS_HEX, CLASS_NAMES)
+        )
+        st.markdown(legend_html, unsafe_allow_html=True)
         
         st.markdown("---")
         
@@ -244,12 +759,15 @@ if not st.session_state.analysis_ready:
         of satellite data.*
         """)
         
-        st.image("https://via.placeholder.com/800x400/2d5016/ffffff?text=Forest+Analysis+Tool", 
-                 use_container_width=True)
+        st.image(str(ASSETS_DIR / "hero.png"), use_container_width=True)
 
 else:
     analyzer = st.session_state.analyzer
     
+    # Leaving the report starts a fresh timestamp on the next visit
+    if analysis_mode != "📋 Comprehensive Report":
+        st.session_state.pop('report_ts', None)
+    
     # ═══════════════════════════════════════════════════════════════════
     # HOME DASHBOARD
     # ═══════════════════════════════════════════════════════════════════
@@ -259,50 +777,40 @@ else:
         
         # Fetch land cover data
         with st.spinner("Loading overview data..."):
-            lc_data = analyzer.calculate_land_cover_areas()
+            lc_data = _lc_areas(analyzer)
         
         # Latest year metrics
-        latest_year = lc_data[lc_data['Year'] == 2024].iloc[0]
-        first_year = lc_data[lc_data['Year'] == 1995].iloc[0]
+        lc_by_year = lc_data.set_index('Year')[analyzer.class_names]
+        latest_year = lc_by_year.loc[2024]
+        first_year = lc_by_year.loc[1995]
+        total_area = latest_year.sum()
+        pct_changes = (latest_year - first_year) / first_year * 100
         
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            forest_2024 = latest_year['Forest']
-            forest_1995 = first_year['Forest']
-            forest_change = ((forest_2024 - forest_1995) / forest_1995 * 100)
-            
             st.metric(
                 label="🌲 Forest Cover (2024)",
-                value=f"{forest_2024:.0f} km²",
-                delta=f"{forest_change:+.1f}% since 1995"
+                value=f"{latest_year['Forest']:.0f} km²",
+                delta=f"{pct_changes['Forest']:+.1f}% since 1995"
             )
         
         with col2:
-            tea_2024 = latest_year['Tea Plantations']
-            tea_1995 = first_year['Tea Plantations']
-            tea_change = ((tea_2024 - tea_1995) / tea_1995 * 100)
-            
             st.metric(
                 label="🍃 Tea Plantations (2024)",
-                value=f"{tea_2024:.0f} km²",
-                delta=f"{tea_change:+.1f}% since 1995"
+                value=f"{latest_year['Tea Plantations']:.0f} km²",
+                delta=f"{pct_changes['Tea Plantations']:+.1f}% since 1995"
             )
         
         with col3:
-            builtup_2024 = latest_year['Built-up']
-            builtup_1995 = first_year['Built-up']
-            builtup_change = ((builtup_2024 - builtup_1995) / builtup_1995 * 100)
-            
             st.metric(
                 label="🏘️ Built-up Areas (2024)",
-                value=f"{builtup_2024:.0f} km²",
-                delta=f"{builtup_change:+.1f}% since 1995"
+                value=f"{latest_year['Built-up']:.0f} km²",
+                delta=f"{pct_changes['Built-up']:+.1f}% since 1995"
             )
         
         with col4:
-            total_area = sum([latest_year[c] for c in analyzer.class_names])
             st.metric(
                 label="📍 Total Study Area",
                 value=f"{total_area:.0f} km²",
@@ -317,42 +825,13 @@ else:
         with col1:
             st.markdown("### 📊 Land Cover Trends")
             
-            fig = go.Figure()
-            
-            for class_name in analyzer.class_names:
-                fig.add_trace(go.Scatter(
-                    x=lc_data['Year'],
-                    y=lc_data[class_name],
-                    mode='lines+markers',
-                    name=class_name,
-                    line=dict(width=3),
-                    marker=dict(size=8)
-                ))
-            
-            fig.update_layout(
-                xaxis_title="Year",
-                yaxis_title="Area (km²)",
-                hovermode='x unified',
-                height=400,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            
+            fig = _fig_lc_trend(_melt_by_year(_downsample_by_year(lc_data), 'Class', 'Area'))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("### 🥧 Current Distribution (2024)")
             
-            pie_data = {k: v for k, v in latest_year.items() if k != 'Year'}
-            
-            fig = go.Figure(data=[go.Pie(
-                labels=list(pie_data.keys()),
-                values=list(pie_data.values()),
-                hole=0.4,
-                marker=dict(colors=['#006400', '#90EE90', '#ADFF2F', '#D2B48C', '#FF0000'])
-            )])
-            
-            fig.update_layout(height=400)
-            
+            fig = _fig_lc_pie(latest_year)
             st.plotly_chart(fig, use_container_width=True)
     
     
@@ -363,47 +842,34 @@ else:
     elif analysis_mode == "📈 Land Cover Statistics":
         st.markdown("## 📈 Land Cover Statistics & Trends")
         
+        import plotly.express as px
+        
         with st.spinner("Calculating land cover areas..."):
-            lc_data = analyzer.calculate_land_cover_areas()
+            lc_data = _lc_areas(analyzer)
         
         # Display data table
         st.markdown("### 📋 Area Statistics (km²)")
         st.dataframe(lc_data, use_container_width=True, height=200)
         
         # Download button
-        csv = lc_data.to_csv(index=False)
         st.download_button(
             label="📥 Download Data (CSV)",
-            data=csv,
+            data=_to_csv_bytes(lc_data),
             file_name=f"kericho_landcover_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
         
         st.markdown("---")
         
+        lc_melt = _melt_by_year(_downsample_by_year(lc_data), 'Class', 'Area')
+        
         # Stacked bar chart
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### 📊 Stacked Distribution by Year")
             
-            fig = go.Figure()
-            
-            for class_name in analyzer.class_names:
-                fig.add_trace(go.Bar(
-                    name=class_name,
-                    x=lc_data['Year'],
-                    y=lc_data[class_name],
-                ))
-            
-            fig.update_layout(
-                barmode='stack',
-                xaxis_title="Year",
-                yaxis_title="Area (km²)",
-                height=450,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            
+            fig = _fig_lc_stacked(lc_melt)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
@@ -415,17 +881,11 @@ else:
                 default=['Forest', 'Tea Plantations']
             )
             
-            fig = go.Figure()
-            
-            for class_name in selected_classes:
-                fig.add_trace(go.Scatter(
-                    x=lc_data['Year'],
-                    y=lc_data[class_name],
-                    mode='lines+markers',
-                    name=class_name,
-                    line=dict(width=3),
-                    marker=dict(size=10)
-                ))
+            fig = px.line(
+                lc_melt[lc_melt['Class'].isin(selected_classes)],
+                x='Year', y='Area', color='Class', markers=True
+            )
+            fig.update_traces(line=dict(width=3), marker=dict(size=10))
             
             fig.update_layout(
                 xaxis_title="Year",
@@ -440,49 +900,16 @@ else:
         st.markdown("---")
         st.markdown("### 🥧 Distribution by Year")
         
-        cols = st.columns(4)
+        lc_indexed = lc_data.set_index('Year').loc[analyzer.years, analyzer.class_names]
         
-        for idx, year in enumerate(analyzer.years):
-            with cols[idx]:
-                year_data = lc_data[lc_data['Year'] == year].iloc[0]
-                pie_data = {k: v for k, v in year_data.items() if k != 'Year'}
-                
-                fig = go.Figure(data=[go.Pie(
-                    labels=list(pie_data.keys()),
-                    values=list(pie_data.values()),
-                    hole=0.3,
-                    marker=dict(colors=['#006400', '#90EE90', '#ADFF2F', '#D2B48C', '#FF0000'])
-                )])
-                
-                fig.update_layout(
-                    title=str(year),
-                    height=300,
-                    showlegend=False
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+        fig = _fig_year_pies(lc_indexed)
+        st.plotly_chart(fig, use_container_width=True)
         
         # Interactive map
         st.markdown("---")
         st.markdown("### 🗺️ Interactive Map Viewer")
         
-        map_year = st.selectbox("Select year to display:", analyzer.years, index=3)
-        
-        # Create map
-        Map = geemap.Map(center=[-0.37, 35.28], zoom=10)
-        
-        # Add boundary
-        Map.addLayer(analyzer.kericho, {}, 'Study Area', opacity=0.5)
-        
-        # Add classified layer
-        vis_params = {
-            'min': 0,
-            'max': 4,
-            'palette': analyzer.class_colors
-        }
-        Map.addLayer(analyzer.classified[map_year], vis_params, f'{map_year} Land Cover')
-        
-        Map.to_streamlit(height=600)
+        _render_landcover_map(analyzer)
     
     
     # ═══════════════════════════════════════════════════════════════════
@@ -505,7 +932,7 @@ else:
             st.warning("⚠️ 'To Year' must be after 'From Year'")
         else:
             with st.spinner(f"Analyzing changes from {year_from} to {year_to}..."):
-                change_df = analyzer.calculate_change_matrix(year_from, year_to)
+                change_df = _change(analyzer, year_from, year_to)
             
             if len(change_df) == 0:
                 st.info(f"ℹ️ No significant changes detected (>1 km²) between {year_from} and {year_to}")
@@ -516,10 +943,9 @@ else:
                 st.dataframe(change_df[['From', 'To', 'Area (km²)']], use_container_width=True)
                 
                 # Download button
-                csv = change_df.to_csv(index=False)
                 st.download_button(
                     label="📥 Download Changes (CSV)",
-                    data=csv,
+                    data=_to_csv_bytes(change_df.drop(columns=['Transition', 'Color'])),
                     file_name=f"kericho_changes_{year_from}_{year_to}.csv",
                     mime="text/csv"
                 )
@@ -529,18 +955,6 @@ else:
                 # Horizontal bar chart
                 st.markdown("### 📊 Change Magnitude")
                 
-                change_df['Transition'] = change_df['From'] + ' → ' + change_df['To']
-                
-                # Color by source class
-                color_map = {
-                    0: '#006400',
-                    1: '#90EE90',
-                    2: '#ADFF2F',
-                    3: '#D2B48C',
-                    4: '#FF0000'
-                }
-                change_df['Color'] = change_df['From_Class_ID'].map(color_map)
-                
                 fig = go.Figure(go.Bar(
                     x=change_df['Area (km²)'],
                     y=change_df['Transition'],
@@ -563,48 +977,38 @@ else:
         st.markdown("---")
         st.markdown("### 📅 Multi-Period Comparison")
         
-        periods = [
-            (1995, 2005, "1995-2005"),
-            (2005, 2015, "2005-2015"),
-            (2015, 2024, "2015-2024"),
-            (1995, 2024, "1995-2024 (Overall)")
-        ]
-        
-        all_changes = {}
+        # Four extra change matrices are only computed on request
+        st.checkbox("Show multi-period comparison", value=False, key='show_multi_period')
         
-        with st.spinner("Calculating all periods..."):
-            for from_yr, to_yr, label in periods:
-                change_matrix = analyzer.calculate_change_matrix(from_yr, to_yr)
-                if len(change_matrix) > 0:
-                    all_changes[label] = change_matrix
-        
-        if all_changes:
-            tabs = st.tabs(list(all_changes.keys()))
+        if st.session_state.get('show_multi_period', False):
+            with st.spinner("Calculating all periods..."):
+                all_changes = _multi_period_changes(analyzer)
             
-            for idx, (period, df) in enumerate(all_changes.items()):
-                with tabs[idx]:
-                    st.dataframe(df[['From', 'To', 'Area (km²)']], use_container_width=True)
-                    
-                    df['Transition'] = df['From'] + ' → ' + df['To']
-                    
-                    fig = go.Figure(go.Bar(
-                        x=df['Area (km²)'],
-                        y=df['Transition'],
-                        orientation='h',
-                        marker=dict(color='#2d5016'),
-                        text=df['Area (km²)'],
-                        textposition='auto'
-                    ))
-                    
-                    fig.update_layout(
-                        title=f"Changes during {period}",
-                        xaxis_title="Area (km²)",
-                        yaxis_title="Transition",
-                        height=max(300, len(df) * 35),
-                        showlegend=False
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
+            if all_changes:
+                tabs = st.tabs(list(all_changes.keys()))
+                
+                for idx, (period, df) in enumerate(all_changes.items()):
+                    with tabs[idx]:
+                        st.dataframe(df[['From', 'To', 'Area (km²)']], use_container_width=True)
+                        
+                        fig = go.Figure(go.Bar(
+                            x=df['Area (km²)'],
+                            y=df['Transition'],
+                            orientation='h',
+                            marker=dict(color='#2d5016'),
+                            text=df['Area (km²)'],
+                            textposition='auto'
+                        ))
+                        
+                        fig.update_layout(
+                            title=f"Changes during {period}",
+                            xaxis_title="Area (km²)",
+                            yaxis_title="Transition",
+                            height=max(300, len(df) * 35),
+                            showlegend=False
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
     
     
     # ═══════════════════════════════════════════════════════════════════
@@ -615,16 +1019,15 @@ else:
         st.markdown("## 🌿 Vegetation Health Analysis")
         
         with st.spinner("Calculating vegetation indices..."):
-            veg_data = analyzer.get_vegetation_indices_trends()
+            veg_data = _veg_trends(analyzer)
         
         st.markdown("### 📋 Index Values Over Time")
         st.dataframe(veg_data, use_container_width=True)
         
         # Download
-        csv = veg_data.to_csv(index=False)
         st.download_button(
             label="📥 Download Index Data (CSV)",
-            data=csv,
+            data=_to_csv_bytes(veg_data),
             file_name=f"kericho_vegetation_indices_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
@@ -636,30 +1039,11 @@ else:
         
         indices_to_plot = st.multiselect(
             "Select indices to display:",
-            ['NDVI', 'EVI', 'NDWI', 'SAVI', 'NBR', 'BSI', 'NDBI', 'MNDWI'],
+            VEG_INDICES,
             default=['NDVI', 'EVI', 'NDWI']
         )
         
-        fig = go.Figure()
-        
-        for index in indices_to_plot:
-            fig.add_trace(go.Scatter(
-                x=veg_data['Year'],
-                y=veg_data[index],
-                mode='lines+markers',
-                name=index,
-                line=dict(width=3),
-                marker=dict(size=10)
-            ))
-        
-        fig.update_layout(
-            xaxis_title="Year",
-            yaxis_title="Index Value",
-            height=500,
-            hovermode='x unified',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
+        fig = _fig_veg_trend(_melt_by_year(_downsample_by_year(veg_data), 'Index', 'Value'), indices_to_plot)
         st.plotly_chart(fig, use_container_width=True)
         
         # Index descriptions
@@ -682,47 +1066,7 @@ else:
         st.markdown("---")
         st.markdown("### 🗺️ Spatial Visualization")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            selected_index = st.selectbox(
-                "Select index:",
-                ['NDVI', 'EVI', 'NDWI', 'SAVI', 'NBR', 'BSI', 'NDBI', 'MNDWI']
-            )
-        
-        with col2:
-            selected_year = st.selectbox(
-                "Select year:",
-                analyzer.years,
-                index=3
-            )
-        
-        # Create map
-        Map = geemap.Map(center=[-0.37, 35.28], zoom=10)
-        
-        # Add boundary
-        Map.addLayer(analyzer.kericho, {}, 'Study Area', opacity=0.5)
-        
-        # Visualization parameters for each index
-        vis_params_map = {
-            'NDVI': {'min': -0.2, 'max': 0.8, 'palette': ['ff0000', 'ffff00', '00ff00']},
-            'EVI': {'min': -0.2, 'max': 0.8, 'palette': ['8B4513', 'ffff00', '00ff00']},
-            'NDWI': {'min': -0.5, 'max': 0.5, 'palette': ['8B4513', 'ffffff', '0000ff']},
-            'SAVI': {'min': -0.2, 'max': 0.8, 'palette': ['ff0000', 'ffff00', '00ff00']},
-            'NBR': {'min': -0.5, 'max': 0.5, 'palette': ['ff0000', 'ffff00', '00ff00']},
-            'BSI': {'min': -1, 'max': 1, 'palette': ['00ff00', 'ffffff', '8B4513']},
-            'NDBI': {'min': -1, 'max': 1, 'palette': ['00ff00', 'ffffff', '808080']},
-            'MNDWI': {'min': -0.5, 'max': 0.5, 'palette': ['8B4513', 'ffffff', '0000ff']}
-        }
-        
-        # Add index layer
-        Map.addLayer(
-            analyzer.indices[selected_year].select(selected_index),
-            vis_params_map[selected_index],
-            f'{selected_year} - {selected_index}'
-        )
-        
-        Map.to_streamlit(height=600)
+        _render_index_map(analyzer)
     
     
     # ═══════════════════════════════════════════════════════════════════
@@ -735,16 +1079,15 @@ else:
         st.info("ℹ️ **Note:** Temperature data (MODIS) is only available from 2000 onwards. Years before 2000 show precipitation data only.")
         
         with st.spinner("Loading climate data..."):
-            climate_data = analyzer.get_climate_trends()
+            climate_data = _climate(analyzer)
         
         st.markdown("### 📋 Climate Data")
         st.dataframe(climate_data, use_container_width=True)
         
         # Download
-        csv = climate_data.to_csv(index=False)
         st.download_button(
             label="📥 Download Climate Data (CSV)",
-            data=csv,
+            data=_to_csv_bytes(climate_data),
             file_name=f"kericho_climate_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
@@ -754,42 +1097,7 @@ else:
         # Dual-axis chart
         st.markdown("### 📊 Temperature & Precipitation Trends")
         
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-        
-        # Temperature
-        fig.add_trace(
-            go.Scatter(
-                x=climate_data['Year'],
-                y=climate_data['Temperature (°C)'],
-                name="Temperature",
-                line=dict(color='red', width=3),
-                marker=dict(size=10)
-            ),
-            secondary_y=False
-        )
-        
-        # Precipitation
-        fig.add_trace(
-            go.Scatter(
-                x=climate_data['Year'],
-                y=climate_data['Precipitation (mm)'],
-                name="Precipitation",
-                line=dict(color='blue', width=3),
-                marker=dict(size=10)
-            ),
-            secondary_y=True
-        )
-        
-        fig.update_xaxes(title_text="Year")
-        fig.update_yaxes(title_text="Temperature (°C)", secondary_y=False)
-        fig.update_yaxes(title_text="Precipitation (mm)", secondary_y=True)
-        
-        fig.update_layout(
-            height=500,
-            hovermode='x unified',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
+        fig = _climate_dual_fig(_downsample_by_year(climate_data))
         st.plotly_chart(fig, use_container_width=True)
         
         # Individual charts
@@ -798,87 +1106,20 @@ else:
         with col1:
             st.markdown("### 🌡️ Temperature Trend")
             
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=climate_data['Year'],
-                y=climate_data['Temperature (°C)'],
-                mode='lines+markers',
-                fill='tozeroy',
-                line=dict(color='red', width=3),
-                marker=dict(size=10)
-            ))
-            
-            fig.update_layout(
-                xaxis_title="Year",
-                yaxis_title="Temperature (°C)",
-                height=350
-            )
-            
+            fig = _temp_area_fig(_downsample_by_year(climate_data))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("### 💧 Precipitation Trend")
             
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=climate_data['Year'],
-                y=climate_data['Precipitation (mm)'],
-                mode='lines+markers',
-                fill='tozeroy',
-                line=dict(color='blue', width=3),
-                marker=dict(size=10)
-            ))
-            
-            fig.update_layout(
-                xaxis_title="Year",
-                yaxis_title="Precipitation (mm)",
-                height=350
-            )
-            
+            fig = _precip_area_fig(_downsample_by_year(climate_data))
             st.plotly_chart(fig, use_container_width=True)
         
         # Map visualization
         st.markdown("---")
         st.markdown("### 🗺️ Spatial Climate Patterns")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            climate_var = st.selectbox(
-                "Select variable:",
-                ['Temperature', 'Precipitation']
-            )
-        
-        with col2:
-            climate_year = st.selectbox(
-                "Select year:",
-                analyzer.years,
-                index=3,
-                key='climate_year'
-            )
-        
-        # Create map
-        Map = geemap.Map(center=[-0.37, 35.28], zoom=10)
-        
-        # Add boundary
-        Map.addLayer(analyzer.kericho, {}, 'Study Area', opacity=0.5)
-        
-        # Visualization parameters
-        if climate_var == 'Temperature':
-            vis_params = {'min': 15, 'max': 35, 'palette': ['0000ff', 'ffffff', 'ff0000']}
-            band_name = 'temperature'
-        else:
-            vis_params = {'min': 800, 'max': 2000, 'palette': ['ffffff', '0000ff', '00008b']}
-            band_name = 'precipitation'
-        
-        # Add climate layer
-        Map.addLayer(
-            analyzer.climate[climate_year].select(band_name),
-            vis_params,
-            f'{climate_year} - {climate_var}'
-        )
-        
-        Map.to_streamlit(height=600)
+        _render_climate_map(analyzer)
     
     
     # ═══════════════════════════════════════════════════════════════════
@@ -887,46 +1128,71 @@ else:
     
     elif analysis_mode == "📋 Comprehensive Report":
         st.markdown("## 📋 Comprehensive Analysis Report")
-        st.markdown(f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
+        
+        # One timestamp per report visit, so reruns keep the same stamp
+        if 'report_ts' not in st.session_state:
+            st.session_state.report_ts = datetime.now()
+        report_ts = st.session_state.report_ts
+        date_str = report_ts.strftime('%Y%m%d')
+        iso_str = report_ts.strftime('%Y-%m-%d %H:%M:%S')
+        
+        st.markdown(f"*Generated: {iso_str}*")
         
         st.info("ℹ️ **Note:** Temperature data (MODIS) is only available from 2000 onwards.")
         
         with st.spinner("Generating comprehensive report..."):
-            # Fetch all data
-            lc_data = analyzer.calculate_land_cover_areas()
-            veg_data = analyzer.get_vegetation_indices_trends()
-            climate_data = analyzer.get_climate_trends()
+            # Fetch all data; the queries are independent and network-bound,
+            # so their GEE round-trips overlap. Workers share this script's
+            # run context so the cached wrappers behave as on the main thread.
+            with ThreadPoolExecutor(
+                max_workers=4,
+                initializer=add_script_run_ctx,
+                initargs=(None, get_script_run_ctx())
+            ) as executor:
+                futures = {
+                    'lc': executor.submit(_lc_areas, analyzer),
+                    'veg': executor.submit(_veg_trends, analyzer),
+                    'climate': executor.submit(_climate, analyzer),
+                    # Key changes
+                    'change': executor.submit(_change, analyzer, 1995, 2024),
+                }
             
-            # Key changes
-            change_1995_2024 = analyzer.calculate_change_matrix(1995, 2024)
+            lc_data = futures['lc'].result()
+            veg_data = futures['veg'].result()
+            climate_data = futures['climate'].result()
+            change_1995_2024 = futures['change'].result()
         
         # Executive Summary
         st.markdown("### 📌 Executive Summary")
         
-        latest = lc_data[lc_data['Year'] == 2024].iloc[0]
-        first = lc_data[lc_data['Year'] == 1995].iloc[0]
+        lc_data_idx = lc_data.set_index('Year')[analyzer.class_names]
+        latest = lc_data_idx.loc[2024]
+        first = lc_data_idx.loc[1995]
+        pct_changes = (latest - first) / first * 100
+        climate_2024 = climate_data.set_index('Year').loc[2024]
+        ndvi_2024 = veg_data.set_index('Year').loc[2024, 'NDVI']
         
         summary_text = f"""
         **Study Period:** 1995 - 2024 (30 years)
         
-        **Study Area:** Kericho County, Kenya (~{sum([latest[c] for c in analyzer.class_names]):.0f} km²)
+        **Study Area:** Kericho County, Kenya (~{latest.sum():.0f} km²)
         
         **Key Findings:**
         
         - **Forest Cover:** {first['Forest']:.0f} km² (1995) → {latest['Forest']:.0f} km² (2024) 
-          [Change: {((latest['Forest'] - first['Forest']) / first['Forest'] * 100):+.1f}%]
+          [Change: {pct_changes['Forest']:+.1f}%]
         
         - **Tea Plantations:** {first['Tea Plantations']:.0f} km² (1995) → {latest['Tea Plantations']:.0f} km² (2024) 
-          [Change: {((latest['Tea Plantations'] - first['Tea Plantations']) / first['Tea Plantations'] * 100):+.1f}%]
+          [Change: {pct_changes['Tea Plantations']:+.1f}%]
         
         - **Built-up Areas:** {first['Built-up']:.0f} km² (1995) → {latest['Built-up']:.0f} km² (2024) 
-          [Change: {((latest['Built-up'] - first['Built-up']) / first['Built-up'] * 100):+.1f}%]
+          [Change: {pct_changes['Built-up']:+.1f}%]
         
-        - **Mean NDVI (2024):** {veg_data[veg_data['Year'] == 2024]['NDVI'].values[0]:.3f}
+        - **Mean NDVI (2024):** {ndvi_2024:.3f}
         
-        - **Mean Temperature (2024):** {climate_data[climate_data['Year'] == 2024]['Temperature (°C)'].values[0]:.1f}°C
+        - **Mean Temperature (2024):** {climate_2024['Temperature (°C)']:.1f}°C
         
-        - **Annual Precipitation (2024):** {climate_data[climate_data['Year'] == 2024]['Precipitation (mm)'].values[0]:.0f} mm
+        - **Annual Precipitation (2024):** {climate_2024['Precipitation (mm)']:.0f} mm
         """
         
         st.info(summary_text)
@@ -946,25 +1212,10 @@ else:
             st.dataframe(lc_data, use_container_width=True)
             
             # Trend chart
-            fig = go.Figure()
-            for class_name in analyzer.class_names:
-                fig.add_trace(go.Scatter(
-                    x=lc_data['Year'],
-                    y=lc_data[class_name],
-                    mode='lines+markers',
-                    name=class_name,
-                    line=dict(width=3),
-                    marker=dict(size=8)
-                ))
-            
-            fig.update_layout(
-                title="Land Cover Trends (1995-2024)",
-                xaxis_title="Year",
-                yaxis_title="Area (km²)",
-                height=400,
-                hovermode='x unified'
+            fig = _fig_lc_trend(
+                _melt_by_year(_downsample_by_year(lc_data), 'Class', 'Area'),
+                title="Land Cover Trends (1995-2024)"
             )
-            
             st.plotly_chart(fig, use_container_width=True)
         
         with tab2:
@@ -974,21 +1225,7 @@ else:
                 st.dataframe(change_1995_2024[['From', 'To', 'Area (km²)']], use_container_width=True)
                 
                 # Bar chart
-                change_1995_2024['Transition'] = change_1995_2024['From'] + ' → ' + change_1995_2024['To']
-                
-                fig = go.Figure(go.Bar(
-                    x=change_1995_2024['Area (km²)'],
-                    y=change_1995_2024['Transition'],
-                    orientation='h',
-                    marker=dict(color='#2d5016')
-                ))
-                
-                fig.update_layout(
-                    title="Significant Transitions",
-                    xaxis_title="Area (km²)",
-                    height=max(300, len(change_1995_2024) * 40)
-                )
-                
+                fig = _fig_report_changes(change_1995_2024)
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No significant changes detected (>1 km²)")
@@ -998,25 +1235,13 @@ else:
             st.dataframe(veg_data, use_container_width=True)
             
             # Multi-line chart
-            fig = go.Figure()
-            for index in ['NDVI', 'EVI', 'NDWI']:
-                fig.add_trace(go.Scatter(
-                    x=veg_data['Year'],
-                    y=veg_data[index],
-                    mode='lines+markers',
-                    name=index,
-                    line=dict(width=3),
-                    marker=dict(size=8)
-                ))
-            
-            fig.update_layout(
+            fig = _fig_veg_trend(
+                _melt_by_year(_downsample_by_year(veg_data), 'Index', 'Value'),
+                ['NDVI', 'EVI', 'NDWI'],
                 title="Key Vegetation Indices",
-                xaxis_title="Year",
-                yaxis_title="Index Value",
                 height=400,
-                hovermode='x unified'
+                marker_size=8
             )
-            
             st.plotly_chart(fig, use_container_width=True)
         
         with tab4:
@@ -1024,40 +1249,12 @@ else:
             st.dataframe(climate_data, use_container_width=True)
             
             # Dual-axis chart
-            fig = make_subplots(specs=[[{"secondary_y": True}]])
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=climate_data['Year'],
-                    y=climate_data['Temperature (°C)'],
-                    name="Temperature",
-                    line=dict(color='red', width=3),
-                    marker=dict(size=8)
-                ),
-                secondary_y=False
-            )
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=climate_data['Year'],
-                    y=climate_data['Precipitation (mm)'],
-                    name="Precipitation",
-                    line=dict(color='blue', width=3),
-                    marker=dict(size=8)
-                ),
-                secondary_y=True
-            )
-            
-            fig.update_xaxes(title_text="Year")
-            fig.update_yaxes(title_text="Temperature (°C)", secondary_y=False)
-            fig.update_yaxes(title_text="Precipitation (mm)", secondary_y=True)
-            
-            fig.update_layout(
+            fig = _climate_dual_fig(
+                _downsample_by_year(climate_data),
                 title="Climate Variables Over Time",
                 height=400,
-                hovermode='x unified'
+                marker_size=8
             )
-            
             st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("---")
@@ -1068,29 +1265,26 @@ else:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            csv_lc = lc_data.to_csv(index=False)
             st.download_button(
                 label="Land Cover Data",
-                data=csv_lc,
-                file_name=f"landcover_{datetime.now().strftime('%Y%m%d')}.csv",
+                data=_to_csv_bytes(lc_data),
+                file_name=f"landcover_{date_str}.csv",
                 mime="text/csv"
             )
         
         with col2:
-            csv_veg = veg_data.to_csv(index=False)
             st.download_button(
                 label="Vegetation Indices",
-                data=csv_veg,
-                file_name=f"vegetation_{datetime.now().strftime('%Y%m%d')}.csv",
+                data=_to_csv_bytes(veg_data),
+                file_name=f"vegetation_{date_str}.csv",
                 mime="text/csv"
             )
         
         with col3:
-            csv_climate = climate_data.to_csv(index=False)
             st.download_button(
                 label="Climate Data",
-                data=csv_climate,
-                file_name=f"climate_{datetime.now().strftime('%Y%m%d')}.csv",
+                data=_to_csv_bytes(climate_data),
+                file_name=f"climate_{date_str}.csv",
                 mime="text/csv"
             )
 
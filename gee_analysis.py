@@ -4,6 +4,8 @@ Converted from JavaScript to Python
 """
 
 import ee
+import hashlib
+import time
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
@@ -12,19 +14,62 @@ from typing import Dict, List, Tuple, Optional
 class KerichoForestAnalysis:
     """Main analysis class for Kericho County forest change detection."""
     
-    def __init__(self):
-        """Initialize the analysis with constants and configurations."""
+    # QA_PIXEL bits 0-4: fill, dilated cloud, cirrus, cloud, cloud shadow
+    QA_CLOUD_BITS = 0b11111
+    
+    # Years imaged by Landsat 5/7 (TM/ETM+ band numbering); later years use 8/9
+    L457_YEARS = (1995, 2005)
+    
+    # Reflectance bands used as classifier inputs for each sensor family
+    BANDS_457 = ['SR_B1', 'SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B7']
+    BANDS_89 = ['SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7']
+    
+    # Bump whenever a query method changes the columns or dtypes it returns,
+    # so results persisted under cache_key() by older code are not reused
+    RESULTS_SCHEMA_VERSION = 3
+    
+    # County boundaries; its updateTime is part of cache_key()
+    BOUNDARY_ASSET = "projects/ee-chrysanthusjumaa23/assets/counties"
+    
+    # Seconds before asset updateTimes are re-read, so assets re-exported
+    # in place under the same ID invalidate persisted results within an hour
+    ASSET_VERSION_MAX_AGE = 3600
+    
+    # Default Random Forest settings; other smileRandomForest keys such as
+    # minLeafPopulation or bagFraction keep GEE's defaults unless given.
+    # Compare alternatives with assess_accuracy() before changing these.
+    DEFAULT_RF_PARAMS = {'numberOfTrees': 100}
+    
+    def __init__(self, rf_params: Optional[Dict] = None):
+        """
+        Initialize the analysis with constants and configurations.
+        
+        Args:
+            rf_params: Keyword arguments for ee.Classifier.smileRandomForest,
+                merged over DEFAULT_RF_PARAMS
+        """
         self.class_colors = ['006400', '90EE90', 'ADFF2F', 'D2B48C', 'FF0000']
         self.class_names = ['Forest', 'Tea Plantations', 'Other Vegetation', 'Bare Soil/Land', 'Built-up']
         self.years = [1995, 2005, 2015, 2024]
         
+        # Random Forest settings passed to ee.Classifier.smileRandomForest
+        self.rf_params = {**self.DEFAULT_RF_PARAMS, **(rf_params or {})}
+        
         # Load Kericho boundary
-        self.kericho = ee.FeatureCollection("projects/ee-chrysanthusjumaa23/assets/counties") \
+        self.kericho = ee.FeatureCollection(self.BOUNDARY_ASSET) \
             .filter(ee.Filter.eq('COUNTY_NAM', 'KERICHO'))
         
-        # Training data (imported geometries)
+        # Reducer region, extracted once and simplified to within a Landsat pixel
+        self.kericho_geom = self.kericho.geometry().simplify(maxError=30)
+        
+        # Training data (imported geometries) and the asset IDs they came from
+        self.training_assets = []
         self.training_data = self._load_training_data()
         
+        # Asset updateTimes for cache_key(), and when they were last read
+        self._asset_versions = None
+        self._asset_versions_read_at = 0.0
+        
         # Store processed images
         self.images = {}
         self.indices = {}
@@ -51,6 +96,7 @@ class KerichoForestAnalysis:
             try:
                 asset_path = f'{base_path}/{class_name}_{year}'
                 fc = ee.FeatureCollection(asset_path)
+                self.training_assets.append(asset_path)
                 return fc.geometry()
             except Exception as e:
                 print(f"Warning: Could not load {class_name}_{year} from {asset_path}")
@@ -95,102 +141,94 @@ class KerichoForestAnalysis:
         Run the complete initialization: load imagery, calculate indices, classify.
         
         Args:
-            progress_callback: Optional function to report progress
+            progress_callback: Optional function called as (pct, message)
+                after each stage, with pct in the range 0-100
         """
         if progress_callback:
-            progress_callback("Loading satellite imagery...")
+            progress_callback(0, "Loading satellite imagery...")
         
         self._load_imagery()
         
         if progress_callback:
-            progress_callback("Calculating vegetation indices...")
+            progress_callback(25, "Calculating vegetation indices...")
         
         self._calculate_indices()
         
         if progress_callback:
-            progress_callback("Running classifications...")
+            progress_callback(50, "Running classifications...")
         
         self._classify_images()
         
         if progress_callback:
-            progress_callback("Loading climate data...")
+            progress_callback(75, "Loading climate data...")
         
         self._load_climate_data()
         
         if progress_callback:
-            progress_callback("Analysis ready!")
+            progress_callback(100, "✅ Analysis ready!")
     
-    def _mask_l457sr(self, image: ee.Image) -> ee.Image:
-        """Cloud masking for Landsat 4/5/7."""
-        qa_mask = image.select('QA_PIXEL').bitwiseAnd(int('11111', 2)).eq(0)
-        saturation_mask = image.select('QA_RADSAT').eq(0)
-        return image.updateMask(qa_mask).updateMask(saturation_mask)
-    
-    def _mask_l89sr(self, image: ee.Image) -> ee.Image:
-        """Cloud masking for Landsat 8/9."""
-        qa_mask = image.select('QA_PIXEL').bitwiseAnd(int('11111', 2)).eq(0)
+    def _mask_sr(self, image: ee.Image) -> ee.Image:
+        """Cloud masking for Landsat 4/5/7/8/9 Collection 2 surface reflectance."""
+        qa_mask = image.select('QA_PIXEL').bitwiseAnd(self.QA_CLOUD_BITS).eq(0)
         saturation_mask = image.select('QA_RADSAT').eq(0)
         return image.updateMask(qa_mask).updateMask(saturation_mask)
     
     def _get_clean_composite(self, year: int, start_month: int, end_month: int, 
                             collection: ee.ImageCollection, mask_func) -> ee.Image:
-        """Create cloud-free composite for a given year."""
+        """
+        Create cloud-free composite for a given year.
+        
+        The composite is left unclipped: reducers bound their work with the
+        county geometry, and map layers clip at display time.
+        """
         start_date = ee.Date.fromYMD(year, start_month, 1)
         end_date = ee.Date.fromYMD(year, end_month, 28)
         
         composite = collection.filterDate(start_date, end_date) \
             .filterBounds(self.kericho) \
             .map(mask_func) \
-            .median() \
-            .clip(self.kericho)
+            .median()
         
         return composite
     
     def _load_imagery(self):
         """Load Landsat imagery for all years."""
-        l5 = ee.ImageCollection('LANDSAT/LT05/C02/T1_L2')
-        l7 = ee.ImageCollection('LANDSAT/LE07/C02/T1_L2')
-        l8 = ee.ImageCollection('LANDSAT/LC08/C02/T1_L2')
-        l9 = ee.ImageCollection('LANDSAT/LC09/C02/T1_L2')
-        
-        self.images[1995] = self._get_clean_composite(1995, 1, 12, l5, self._mask_l457sr)
-        self.images[2005] = self._get_clean_composite(2005, 1, 12, l7, self._mask_l457sr)
-        self.images[2015] = self._get_clean_composite(2015, 1, 12, l8, self._mask_l89sr)
-        self.images[2024] = self._get_clean_composite(2024, 1, 12, l9, self._mask_l89sr)
+        collections = {
+            1995: ee.ImageCollection('LANDSAT/LT05/C02/T1_L2'),
+            2005: ee.ImageCollection('LANDSAT/LE07/C02/T1_L2'),
+            2015: ee.ImageCollection('LANDSAT/LC08/C02/T1_L2'),
+            2024: ee.ImageCollection('LANDSAT/LC09/C02/T1_L2'),
+        }
+        
+        self.images = {
+            year: self._get_clean_composite(year, 1, 12, collections[year], self._mask_sr)
+            for year in self.years
+        }
     
     def _calculate_indices_l457(self, image: ee.Image) -> ee.Image:
         """Calculate vegetation indices for Landsat 4/5/7."""
+        blue = image.select('SR_B1')
+        red = image.select('SR_B3')
+        nir = image.select('SR_B4')
+        swir = image.select('SR_B5')
+        
         ndvi = image.normalizedDifference(['SR_B4', 'SR_B3']).rename('NDVI')
         ndwi = image.normalizedDifference(['SR_B4', 'SR_B5']).rename('NDWI')
         
-        evi = image.expression(
-            '2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))',
-            {
-                'NIR': image.select('SR_B4'),
-                'RED': image.select('SR_B3'),
-                'BLUE': image.select('SR_B1')
-            }
-        ).rename('EVI')
+        # EVI = 2.5 * (NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1)
+        evi = nir.subtract(red).multiply(2.5) \
+            .divide(nir.add(red.multiply(6)).subtract(blue.multiply(7.5)).add(1)) \
+            .rename('EVI')
         
-        savi = image.expression(
-            '((NIR - RED) / (NIR + RED + 0.5)) * 1.5',
-            {
-                'NIR': image.select('SR_B4'),
-                'RED': image.select('SR_B3')
-            }
-        ).rename('SAVI')
+        # SAVI = (NIR - RED) / (NIR + RED + 0.5) * 1.5
+        savi = nir.subtract(red).divide(nir.add(red).add(0.5)).multiply(1.5).rename('SAVI')
         
         nbr = image.normalizedDifference(['SR_B4', 'SR_B7']).rename('NBR')
         
-        bsi = image.expression(
-            '((SWIR + RED) - (NIR + BLUE)) / ((SWIR + RED) + (NIR + BLUE))',
-            {
-                'SWIR': image.select('SR_B5'),
-                'RED': image.select('SR_B3'),
-                'NIR': image.select('SR_B4'),
-                'BLUE': image.select('SR_B1')
-            }
-        ).rename('BSI')
+        # BSI = ((SWIR + RED) - (NIR + BLUE)) / ((SWIR + RED) + (NIR + BLUE))
+        swir_red = swir.add(red)
+        nir_blue = nir.add(blue)
+        bsi = swir_red.subtract(nir_blue).divide(swir_red.add(nir_blue)).rename('BSI')
         
         ndbi = image.normalizedDifference(['SR_B5', 'SR_B4']).rename('NDBI')
         mndwi = image.normalizedDifference(['SR_B2', 'SR_B5']).rename('MNDWI')
@@ -199,37 +237,28 @@ class KerichoForestAnalysis:
     
     def _calculate_indices_l89(self, image: ee.Image) -> ee.Image:
         """Calculate vegetation indices for Landsat 8/9."""
+        blue = image.select('SR_B2')
+        red = image.select('SR_B4')
+        nir = image.select('SR_B5')
+        swir = image.select('SR_B6')
+        
         ndvi = image.normalizedDifference(['SR_B5', 'SR_B4']).rename('NDVI')
         ndwi = image.normalizedDifference(['SR_B5', 'SR_B6']).rename('NDWI')
         
-        evi = image.expression(
-            '2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))',
-            {
-                'NIR': image.select('SR_B5'),
-                'RED': image.select('SR_B4'),
-                'BLUE': image.select('SR_B2')
-            }
-        ).rename('EVI')
+        # EVI = 2.5 * (NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1)
+        evi = nir.subtract(red).multiply(2.5) \
+            .divide(nir.add(red.multiply(6)).subtract(blue.multiply(7.5)).add(1)) \
+            .rename('EVI')
         
-        savi = image.expression(
-            '((NIR - RED) / (NIR + RED + 0.5)) * 1.5',
-            {
-                'NIR': image.select('SR_B5'),
-                'RED': image.select('SR_B4')
-            }
-        ).rename('SAVI')
+        # SAVI = (NIR - RED) / (NIR + RED + 0.5) * 1.5
+        savi = nir.subtract(red).divide(nir.add(red).add(0.5)).multiply(1.5).rename('SAVI')
         
         nbr = image.normalizedDifference(['SR_B5', 'SR_B7']).rename('NBR')
         
-        bsi = image.expression(
-            '((SWIR + RED) - (NIR + BLUE)) / ((SWIR + RED) + (NIR + BLUE))',
-            {
-                'SWIR': image.select('SR_B6'),
-                'RED': image.select('SR_B4'),
-                'NIR': image.select('SR_B5'),
-                'BLUE': image.select('SR_B2')
-            }
-        ).rename('BSI')
+        # BSI = ((SWIR + RED) - (NIR + BLUE)) / ((SWIR + RED) + (NIR + BLUE))
+        swir_red = swir.add(red)
+        nir_blue = nir.add(blue)
+        bsi = swir_red.subtract(nir_blue).divide(swir_red.add(nir_blue)).rename('BSI')
         
         ndbi = image.normalizedDifference(['SR_B6', 'SR_B5']).rename('NDBI')
         mndwi = image.normalizedDifference(['SR_B3', 'SR_B6']).rename('MNDWI')
@@ -238,10 +267,12 @@ class KerichoForestAnalysis:
     
     def _calculate_indices(self):
         """Calculate indices for all years."""
-        self.indices[1995] = self._calculate_indices_l457(self.images[1995])
-        self.indices[2005] = self._calculate_indices_l457(self.images[2005])
-        self.indices[2015] = self._calculate_indices_l89(self.images[2015])
-        self.indices[2024] = self._calculate_indices_l89(self.images[2024])
+        self.indices = {
+            year: self._calculate_indices_l457(self.images[year])
+            if year in self.L457_YEARS
+            else self._calculate_indices_l89(self.images[year])
+            for year in self.years
+        }
     
     def _prepare_training(self, forest, tea, otherveg, bare, builtup) -> ee.FeatureCollection:
         """Prepare training data from geometries."""
@@ -262,42 +293,55 @@ class KerichoForestAnalysis:
         
         return forest_fc.merge(tea_fc).merge(otherveg_fc).merge(bare_fc).merge(builtup_fc)
     
-    def _classify_image(self, image: ee.Image, training: ee.FeatureCollection, 
-                       bands: List[str]) -> ee.Image:
-        """Classify an image using Random Forest."""
-        training_data = image.select(bands).sampleRegions(
-            collection=training,
-            properties=['landcover'],
-            scale=30
+    def _prepare_training_for_year(self, year: int) -> ee.FeatureCollection:
+        """Merge the training geometries for a year into one FeatureCollection."""
+        training_year = self.training_data[year]
+        return self._prepare_training(
+            training_year['forest'],
+            training_year['tea'],
+            training_year['otherveg'],
+            training_year['bare'],
+            training_year['builtup']
         )
-        
-        classifier = ee.Classifier.smileRandomForest(100).train(
+    
+    def _bands_for_year(self, year: int) -> List[str]:
+        """Classifier input bands for the sensor that imaged a year."""
+        return self.BANDS_457 if year in self.L457_YEARS else self.BANDS_89
+    
+    def _sample_training_for_year(self, year: int) -> ee.FeatureCollection:
+        """Sample the year's composite at its training points."""
+        return self.images[year] \
+            .select(self._bands_for_year(year)) \
+            .sampleRegions(
+                collection=self._prepare_training_for_year(year),
+                properties=['landcover'],
+                scale=30
+            )
+    
+    def _train_classifier(self, training_data: ee.FeatureCollection, bands: List[str],
+                          rf_params: Optional[Dict] = None) -> ee.Classifier:
+        """Train a Random Forest on pre-sampled pixels, defaulting to self.rf_params."""
+        return ee.Classifier.smileRandomForest(**(rf_params or self.rf_params)).train(
             features=training_data,
             classProperty='landcover',
             inputProperties=bands
         )
+    
+    def _classify_image(self, image: ee.Image, training_data: ee.FeatureCollection, 
+                       bands: List[str]) -> ee.Image:
+        """Classify an image using Random Forest trained on pre-sampled pixels."""
+        classifier = self._train_classifier(training_data, bands)
         
         return image.select(bands).classify(classifier)
     
     def _classify_images(self):
         """Classify all years."""
-        bands_457 = ['SR_B1', 'SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B7']
-        bands_89 = ['SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7']
-        
         for year in self.years:
-            training_year = self.training_data[year]
-            training = self._prepare_training(
-                training_year['forest'],
-                training_year['tea'],
-                training_year['otherveg'],
-                training_year['bare'],
-                training_year['builtup']
+            self.classified[year] = self._classify_image(
+                self.images[year],
+                self._sample_training_for_year(year),
+                self._bands_for_year(year)
             )
-            
-            if year in [1995, 2005]:
-                self.classified[year] = self._classify_image(self.images[year], training, bands_457)
-            else:
-                self.classified[year] = self._classify_image(self.images[year], training, bands_89)
     
     def _load_climate_data(self):
         """Load climate data for all years."""
@@ -312,7 +356,6 @@ class KerichoForestAnalysis:
             precip = chirps.filterDate(start_date, end_date) \
                 .filterBounds(self.kericho) \
                 .sum() \
-                .clip(self.kericho) \
                 .rename('precipitation')
             
             # Temperature (MODIS only available from 2000 onwards)
@@ -324,16 +367,84 @@ class KerichoForestAnalysis:
                     .mean() \
                     .multiply(0.02) \
                     .subtract(273.15) \
-                    .clip(self.kericho) \
                     .rename('temperature')
                 
                 self.climate[year] = ee.Image.cat([precip, temp])
             else:
                 # For years before 2000, only store precipitation
                 # Create a dummy temperature band with None/masked values
-                temp = ee.Image.constant(-9999).clip(self.kericho).rename('temperature')
+                temp = ee.Image.constant(-9999).rename('temperature')
                 self.climate[year] = ee.Image.cat([precip, temp])
     
+    def asset_versions(self) -> Dict[str, Optional[str]]:
+        """
+        updateTime of the boundary and training assets, keyed by asset ID.
+        
+        The graphs only name assets by ID, so this is what catches an asset
+        re-exported in place. Re-read after ASSET_VERSION_MAX_AGE seconds;
+        assets that cannot be read map to None.
+        """
+        age = time.monotonic() - self._asset_versions_read_at
+        if self._asset_versions is None or age > self.ASSET_VERSION_MAX_AGE:
+            versions = {}
+            for asset_id in [self.BOUNDARY_ASSET] + self.training_assets:
+                try:
+                    versions[asset_id] = ee.data.getAsset(asset_id).get('updateTime')
+                except ee.EEException:
+                    versions[asset_id] = None
+            self._asset_versions = versions
+            self._asset_versions_read_at = time.monotonic()
+        return self._asset_versions
+    
+    def cache_key(self) -> str:
+        """
+        Fingerprint of the inputs and results schema behind every query.
+        
+        Hashes the client-side serialization of the boundary and processed
+        image graphs together with asset_versions(), so results stored under
+        this key go stale when the boundary or training assets are edited,
+        or the imagery, classifier settings or RESULTS_SCHEMA_VERSION
+        change. Call after initialize_analysis().
+        """
+        graph = ee.List([self.kericho_geom] + [
+            stage[year]
+            for stage in (self.classified, self.indices, self.climate)
+            for year in self.years
+        ])
+        versions = sorted(self.asset_versions().items(), key=lambda item: item[0])
+        payload = f"v{self.RESULTS_SCHEMA_VERSION}:{versions}:{graph.serialize()}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def assess_accuracy(self, year: int, rf_params: Optional[Dict] = None,
+                        train_fraction: float = 0.7, seed: int = 0) -> Dict:
+        """
+        Hold-out accuracy of the classifier for one year.
+        
+        Splits the year's sampled training pixels, trains on one part and
+        scores the rest, so Random Forest settings can be compared (e.g.
+        {'numberOfTrees': 50} against the default) before adopting them.
+        
+        Args:
+            year: Year whose training samples are used
+            rf_params: smileRandomForest settings; defaults to self.rf_params
+            train_fraction: Share of samples used for training
+            seed: Seed for the random split
+            
+        Returns:
+            Dictionary with overall 'accuracy' and 'kappa'
+        """
+        samples = self._sample_training_for_year(year).randomColumn('split', seed)
+        train = samples.filter(ee.Filter.lt('split', train_fraction))
+        test = samples.filter(ee.Filter.gte('split', train_fraction))
+        
+        classifier = self._train_classifier(train, self._bands_for_year(year), rf_params)
+        matrix = test.classify(classifier).errorMatrix('landcover', 'classification')
+        
+        return ee.Dictionary({
+            'accuracy': matrix.accuracy(),
+            'kappa': matrix.kappa()
+        }).getInfo()
+    
     def calculate_land_cover_areas(self) -> pd.DataFrame:
         """
         Calculate land cover areas for all years.
@@ -341,36 +452,32 @@ class KerichoForestAnalysis:
         Returns:
             DataFrame with areas in km² for each class and year
         """
-        results = []
-        
-        for year in self.years:
-            area_image = ee.Image.pixelArea().addBands(self.classified[year])
-            
-            areas = area_image.reduceRegion(
+        # Grouped area sums for every year, fetched in a single getInfo
+        yearly_areas = ee.List([
+            ee.Image.pixelArea().addBands(self.classified[year]).reduceRegion(
                 reducer=ee.Reducer.sum().group(
                     groupField=1,
                     groupName='class'
                 ),
-                geometry=self.kericho.geometry(),
+                geometry=self.kericho_geom,
                 scale=30,
                 maxPixels=1e13
             )
-            
-            # Convert to dictionary
-            area_list = areas.getInfo()['groups']
-            
-            year_areas = {class_name: 0.0 for class_name in self.class_names}
-            
-            for item in area_list:
-                class_id = item['class']
-                area_km2 = item['sum'] / 1_000_000  # Convert m² to km²
-                year_areas[self.class_names[class_id]] = round(area_km2, 2)
-            
-            year_areas['Year'] = year
-            results.append(year_areas)
+            for year in self.years
+        ]).getInfo()
         
-        df = pd.DataFrame(results)
-        return df[['Year'] + self.class_names]
+        # Years x classes; classes absent from a year stay at 0
+        area_table = np.zeros((len(self.years), len(self.class_names)))
+        
+        for row, areas in enumerate(yearly_areas):
+            area_list = areas['groups']
+            class_ids = np.array([item['class'] for item in area_list], dtype=int)
+            sums = np.array([item['sum'] for item in area_list], dtype=float)
+            area_table[row, class_ids] = np.round(sums / 1_000_000, 2)  # Convert m² to km²
+        
+        df = pd.DataFrame(area_table, columns=self.class_names)
+        df.insert(0, 'Year', self.years)
+        return df
     
     def calculate_change_matrix(self, year_from: int, year_to: int) -> pd.DataFrame:
         """
@@ -394,29 +501,31 @@ class KerichoForestAnalysis:
                 groupField=1,
                 groupName='change'
             ),
-            geometry=self.kericho.geometry(),
+            geometry=self.kericho_geom,
             scale=30,
             maxPixels=1e13
         )
         
         change_list = changes.getInfo()['groups']
         
-        results = []
-        for item in change_list:
-            from_class = int(item['change']) // 10
-            to_class = int(item['change']) % 10
-            area_km2 = item['sum'] / 1_000_000
-            
-            # Only include significant changes (>1 km² and actual change)
-            if from_class != to_class and area_km2 > 1:
-                results.append({
-                    'From': self.class_names[from_class],
-                    'To': self.class_names[to_class],
-                    'Area (km²)': round(area_km2, 2),
-                    'From_Class_ID': from_class
-                })
-        
-        df = pd.DataFrame(results)
+        codes = np.array([item['change'] for item in change_list], dtype=float).astype(int)
+        areas = np.array([item['sum'] for item in change_list], dtype=float) / 1_000_000
+        from_class = codes // 10
+        to_class = codes % 10
+        
+        # Only include significant changes (>1 km² and actual change)
+        mask = (from_class != to_class) & (areas > 1)
+        class_names = np.array(self.class_names)
+        from_names = class_names[from_class[mask]]
+        to_names = class_names[to_class[mask]]
+        
+        df = pd.DataFrame({
+            'From': from_names,
+            'To': to_names,
+            'Transition': np.char.add(np.char.add(from_names, ' → '), to_names),
+            'Area (km²)': np.round(areas[mask], 2),
+            'From_Class_ID': from_class[mask]
+        })
         if len(df) > 0:
             df = df.sort_values('Area (km²)', ascending=False)
         
@@ -430,24 +539,28 @@ class KerichoForestAnalysis:
             DataFrame with index values over time
         """
         indices_list = ['NDVI', 'EVI', 'NDWI', 'SAVI', 'NBR', 'BSI', 'NDBI', 'MNDWI']
-        results = []
         
-        for year in self.years:
+        # One reducer per year over all index bands, fetched in a single getInfo
+        yearly_means = ee.List([
+            self.indices[year].select(indices_list).reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=self.kericho_geom,
+                scale=500,
+                maxPixels=1e13
+            )
+            for year in self.years
+        ]).getInfo()
+        
+        results = []
+        for year, means in zip(self.years, yearly_means):
             year_data = {'Year': year}
-            
             for index_name in indices_list:
-                mean_val = self.indices[year].select(index_name).reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=self.kericho.geometry(),
-                    scale=500,
-                    maxPixels=1e13
-                ).getInfo()
-                
-                year_data[index_name] = mean_val.get(index_name)
-            
+                year_data[index_name] = means.get(index_name)
             results.append(year_data)
         
-        return pd.DataFrame(results)
+        df = pd.DataFrame(results)
+        df[indices_list] = df[indices_list].astype('float32')
+        return df
     
     def get_climate_trends(self) -> pd.DataFrame:
         """
@@ -456,25 +569,22 @@ class KerichoForestAnalysis:
         Returns:
             DataFrame with temperature and precipitation over time
         """
-        results = []
-        
-        for year in self.years:
-            temp_mean = self.climate[year].select('temperature').reduceRegion(
+        # Both bands for every year in one batched request
+        yearly_means = ee.List([
+            self.climate[year].select(['temperature', 'precipitation']).reduceRegion(
                 reducer=ee.Reducer.mean(),
-                geometry=self.kericho.geometry(),
+                geometry=self.kericho_geom,
                 scale=1000,
                 maxPixels=1e13
-            ).getInfo()
-            
-            precip_mean = self.climate[year].select('precipitation').reduceRegion(
-                reducer=ee.Reducer.mean(),
-                geometry=self.kericho.geometry(),
-                scale=1000,
-                maxPixels=1e13
-            ).getInfo()
-            
+            )
+            for year in self.years
+        ]).getInfo()
+        
+        results = []
+        
+        for year, means in zip(self.years, yearly_means):
             # Handle missing temperature data (years before 2000)
-            temp_value = temp_mean.get('temperature')
+            temp_value = means.get('temperature')
             if temp_value is not None and temp_value != -9999:
                 temp_display = temp_value
             else:
@@ -483,23 +593,32 @@ class KerichoForestAnalysis:
             results.append({
                 'Year': year,
                 'Temperature (°C)': temp_display,
-                'Precipitation (mm)': precip_mean.get('precipitation')
+                'Precipitation (mm)': means.get('precipitation')
             })
         
-        return pd.DataFrame(results)
+        df = pd.DataFrame(results)
+        climate_cols = ['Temperature (°C)', 'Precipitation (mm)']
+        df[climate_cols] = df[climate_cols].astype('float32')
+        return df
     
     def get_map_layers(self) -> Dict:
         """
         Get map visualization layers for the interactive map.
         
+        Images are clipped to the county here, since the analysis images
+        themselves are left unclipped.
+        
         Returns:
             Dictionary containing ee.Image objects and visualization parameters
         """
+        def clipped(images):
+            return {year: image.clip(self.kericho_geom) for year, image in images.items()}
+        
         return {
             'kericho_boundary': self.kericho,
-            'classified_images': self.classified,
-            'indices_images': self.indices,
-            'climate_images': self.climate,
+            'classified_images': clipped(self.classified),
+            'indices_images': clipped(self.indices),
+            'climate_images': clipped(self.climate),
             'vis_params': {
                 'classified': {
                     'min': 0,